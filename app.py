@@ -1,7 +1,7 @@
 import streamlit as st
 from assistant import speak_and_wait, listen, map_spoken_to_tag
-from post_genrator import generate_post
-from few_shot import FewShotPosts
+from post_genrator import generate_post, few_shot
+from speculative import SpeculativeGenerator
 import time
 import webbrowser
 import pyperclip
@@ -15,6 +15,9 @@ if "alternative_post" not in st.session_state:
     st.session_state.alternative_post = ""
 if "show_alternative" not in st.session_state:
     st.session_state.show_alternative = False
+if "speculative" not in st.session_state:
+    # Background generation for the manual tab, at most 3 wasted LLM calls per session
+    st.session_state.speculative = SpeculativeGenerator(generate_post, debounce=1.5, max_wasted=3)
 
 # Define tab layout
 tab1, tab2 = st.tabs(["🎤 Voice Assistant", "⌨️ Manual Input"])
@@ -143,9 +146,8 @@ with tab1:
 with tab2:
     st.subheader("Manual LinkedIn Post Generator")
     
-    # Initialize FewShotPosts to get available tags
-    fs = FewShotPosts()
-    available_tags = fs.get_tags()
+    # Get available tags from the shared corpus registry
+    available_tags = few_shot.get_tags()
     
     # Define the input form
     col1, col2, col3 = st.columns(3)
@@ -159,11 +161,15 @@ with tab2:
     with col3:
         selected_language = st.selectbox("🌐 Language", options=["English", "Hindi", "Hinglish"])
     
+    # Start generating in the background once the selection settles
+    selection = (selected_length, selected_language, selected_tag)
+    st.session_state.speculative.update(selection)
+    
     # Generate post button
     if st.button("🚀 Generate Post", key="generate_manual"):
         with st.spinner("Generating your LinkedIn post..."):
             # Generate post ensuring it matches the selected tag
-            generated_post = generate_post(selected_length, selected_language, selected_tag)
+            generated_post = st.session_state.speculative.take(selection)
             st.session_state.manual_post = generated_post
             st.session_state.current_tag = selected_tag  # Store current tag for verification
             
@@ -1,7 +1,15 @@
 import pandas as pd
 import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
 from tabulate import tabulate
 
+DEFAULT_CORPUS = "default"
+
 
 class FewShotPosts:
     def __init__(self, file_path="process_data.json"):
@@ -41,6 +49,142 @@ class FewShotPosts:
     def get_tags(self):
         return self.unique_tags
 
+    def memory_bytes(self):
+        """Estimate resident bytes: the DataFrame plus the tag strings it and unique_tags point to."""
+        total = int(self.df.memory_usage(deep=True).sum())
+        # deep=True sizes the tag lists but not the strings inside them
+        total += sum(sys.getsizeof(tag) for tags in self.df['tags'] for tag in tags)
+        total += sys.getsizeof(self.unique_tags) + sum(sys.getsizeof(tag) for tag in self.unique_tags)
+        return total
+
+
+class CorpusRegistry:
+    """Per-author FewShotPosts shards, loaded on first use and kept in a memory-bounded LRU.
+
+    Each corpus is a process_data.json-style file. "default" maps to
+    `default_file`, and every `<corpus_id>.json` in `corpus_dir` is picked up
+    as its own corpus (`corpora/default.json` is ignored so it can't shadow
+    `default_file`). When loaded shards exceed `max_memory_mb` the least
+    recently used ones are evicted, and the shard just requested is always kept.
+
+    Eviction runs only after a load succeeds, so a broken corpus file never
+    evicts healthy shards. The peak can therefore exceed the budget by up to
+    one shard while it loads. Loads happen outside the registry lock.
+    Concurrent requests for the same corpus share a single load.
+    """
+
+    def __init__(self, corpus_dir="corpora", max_memory_mb=256, default_file="process_data.json"):
+        self.max_memory_bytes = int(max_memory_mb * 1024 * 1024)
+        self.paths = {DEFAULT_CORPUS: default_file}
+        self.shards = OrderedDict()
+        self.shard_bytes = {}
+        self.loading = {}
+        self.load_times = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced = 0
+        self.lock = threading.Lock()
+
+        if os.path.isdir(corpus_dir):
+            for name in sorted(os.listdir(corpus_dir)):
+                if name.endswith(".json") and name != f"{DEFAULT_CORPUS}.json":
+                    self.register(name[:-len(".json")], os.path.join(corpus_dir, name))
+
+    def register(self, corpus_id, file_path):
+        with self.lock:
+            self.paths[corpus_id] = file_path
+            self.unload(corpus_id)
+            # Later get() calls must not wait on a load of the old file
+            self.loading.pop(corpus_id, None)
+
+    def get_corpus_ids(self):
+        return sorted(self.paths)
+
+    def get(self, corpus_id=DEFAULT_CORPUS):
+        """Return the FewShotPosts for a corpus, loading it (and evicting others) if needed."""
+        with self.lock:
+            if corpus_id in self.shards:
+                self.hits += 1
+                self.shards.move_to_end(corpus_id)
+                return self.shards[corpus_id]
+
+            if corpus_id not in self.paths:
+                raise KeyError(f"Unknown corpus: {corpus_id}")
+
+            if corpus_id in self.loading:
+                # Someone else is already loading this corpus, wait for their result
+                self.coalesced += 1
+                pending = self.loading[corpus_id]
+            else:
+                self.misses += 1
+                pending = None
+                loading = self.loading[corpus_id] = Future()
+                file_path = self.paths[corpus_id]
+
+        if pending is not None:
+            return pending.result()
+
+        try:
+            start = time.perf_counter()
+            shard = FewShotPosts(file_path)
+            load_time = time.perf_counter() - start
+            shard_bytes = shard.memory_bytes()
+        except Exception as e:
+            with self.lock:
+                self.finish_loading(corpus_id, loading)
+            loading.set_exception(e)
+            raise
+
+        with self.lock:
+            self.finish_loading(corpus_id, loading)
+            # Only cache it if the corpus wasn't re-registered while we were loading
+            if self.paths.get(corpus_id) == file_path:
+                self.load_times[corpus_id] = load_time
+                self.shards[corpus_id] = shard
+                self.shard_bytes[corpus_id] = shard_bytes
+                self.evict()
+        loading.set_result(shard)
+        return shard
+
+    def finish_loading(self, corpus_id, loading):
+        # register() may have replaced this load with one for a new file
+        if self.loading.get(corpus_id) is loading:
+            del self.loading[corpus_id]
+
+    def evict(self):
+        """Evict least recently used shards until back under budget, always keeping the newest."""
+        while len(self.shards) > 1 and self.resident_bytes() > self.max_memory_bytes:
+            oldest = next(iter(self.shards))
+            self.unload(oldest)
+            self.evictions += 1
+
+    def unload(self, corpus_id):
+        self.shards.pop(corpus_id, None)
+        self.shard_bytes.pop(corpus_id, None)
+
+    def resident_bytes(self):
+        return sum(self.shard_bytes.values())
+
+    def get_filtered_posts(self, length, language, tag, corpus_id=DEFAULT_CORPUS):
+        return self.get(corpus_id).get_filtered_posts(length, language, tag)
+
+    def get_tags(self, corpus_id=DEFAULT_CORPUS):
+        return self.get(corpus_id).get_tags()
+
+    def stats(self):
+        with self.lock:
+            return {
+                "resident_bytes": self.resident_bytes(),
+                "max_memory_bytes": self.max_memory_bytes,
+                "loaded": {cid: self.shard_bytes[cid] for cid in self.shards},
+                "load_times": dict(self.load_times),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "coalesced": self.coalesced,
+            }
+
 
 if __name__ == "__main__":
     fs = FewShotPosts()
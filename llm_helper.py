@@ -1,15 +1,34 @@
 from dotenv import load_dotenv
 from langchain_groq import ChatGroq
+from llm_transport import Cassette, RecordingTransport, ReplayTransport
 import os  
 
 # Load environment variables
 load_dotenv()
 
-# Initialize the LLM model
-llm = ChatGroq(
-    groq_api_key=os.getenv("GROQ_API_KEY"),  
-    model_name="llama3-8b-8192"
-)
+# LLM_TRANSPORT: "live" (default), "record" (live + save to cassette) or "replay" (offline from cassette)
+transport_mode = os.getenv("LLM_TRANSPORT", "live").strip().lower()
+cassette_path = os.getenv("LLM_CASSETTE", "llm_cassette.jsonl")
+latency_scale = float(os.getenv("LLM_REPLAY_LATENCY_SCALE", "1.0"))  # 0 = no delay, 0.5 = half the recorded latency
+
+if transport_mode not in ("live", "record", "replay"):
+    # Never fall back to live calls on a typo, that would burn quota
+    raise ValueError(f"Invalid LLM_TRANSPORT: {transport_mode!r} (expected live, record or replay)")
+
+if transport_mode == "replay":
+    # No API key or network needed when replaying
+    cassette = Cassette(cassette_path)
+    if not cassette.order:
+        raise ValueError(f"Cassette {cassette_path} is missing or empty, record it first with LLM_TRANSPORT=record")
+    llm = ReplayTransport(cassette, latency_scale=latency_scale)
+else:
+    # Initialize the LLM model
+    llm = ChatGroq(
+        groq_api_key=os.getenv("GROQ_API_KEY"),  
+        model_name="llama3-8b-8192"
+    )
+    if transport_mode == "record":
+        llm = RecordingTransport(llm, Cassette(cassette_path, load=False))
 
 if __name__ == "__main__":
     response = llm.invoke("What are the two main ingredients in a samosa?")
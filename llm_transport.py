@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import Runnable
+
+
+def prompt_to_text(prompt):
+    """Turn whatever the LLM is invoked with (str, PromptValue, messages) into plain text."""
+    if isinstance(prompt, str):
+        return prompt
+    if hasattr(prompt, "to_string"):
+        return prompt.to_string()
+    if isinstance(prompt, list):
+        return "\n".join(getattr(m, "content", str(m)) for m in prompt)
+    return str(prompt)
+
+
+def prompt_key(prompt):
+    """Short stable key for a prompt so the cassette doesn't store full prompt text."""
+    return hashlib.sha1(prompt_to_text(prompt).encode("utf-8")).hexdigest()[:16]
+
+
+class Cassette:
+    """Recorded responses, latencies and start times keyed by prompt hash, one JSON object per line.
+
+    Pass load=False when only appending (record mode) to skip parsing the existing file.
+    """
+
+    def __init__(self, file_path="llm_cassette.jsonl", load=True):
+        self.file_path = file_path
+        self.entries = {}
+        self.order = []
+        self.lock = threading.Lock()
+        if load and os.path.exists(file_path):
+            self.load()
+
+    def load(self):
+        with open(self.file_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                self.order.append(entry)
+                self.entries.setdefault(entry["key"], []).append(entry)
+
+    def append(self, key, response, latency, started):
+        entry = {"key": key, "response": response, "latency": round(latency, 4), "started": round(started, 4)}
+        with self.lock:
+            self.order.append(entry)
+            self.entries.setdefault(key, []).append(entry)
+            with open(self.file_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
+class RecordingTransport(Runnable):
+    """Calls the real LLM and appends every response and its latency to a cassette."""
+
+    def __init__(self, llm, cassette):
+        self.llm = llm
+        self.cassette = cassette
+
+    def invoke(self, input, config=None, **kwargs):
+        started = time.time()
+        start = time.perf_counter()
+        response = self.llm.invoke(input, config, **kwargs)
+        latency = time.perf_counter() - start
+        self.cassette.append(prompt_key(input), response.content, latency, started)
+        return response
+
+
+class ReplayTransport(Runnable):
+    """Answers from a cassette offline, sleeping for the recorded latency times `latency_scale`.
+
+    A prompt recorded several times (e.g. "Generate Alternative") replays its
+    responses in recorded order and wraps around once they run out.
+    latency_scale=0 replays with no delay, 0.5 with half the recorded latency.
+    """
+
+    def __init__(self, cassette, latency_scale=1.0):
+        self.cassette = cassette
+        self.latency_scale = latency_scale
+        self.positions = {}
+        self.lock = threading.Lock()
+
+    def next_entry(self, key):
+        recorded = self.cassette.entries.get(key)
+        if not recorded:
+            raise KeyError(f"No recorded response for prompt {key} in {self.cassette.file_path}")
+        with self.lock:
+            position = self.positions.get(key, 0)
+            self.positions[key] = position + 1
+        return recorded[position % len(recorded)]
+
+    def invoke(self, input, config=None, **kwargs):
+        entry = self.next_entry(prompt_key(input))
+        if self.latency_scale > 0:
+            time.sleep(entry["latency"] * self.latency_scale)
+        return AIMessage(content=entry["response"])
+
+
+def replay_cassette(cassette, latency_scale=1.0, concurrency=1, paced=False):
+    """Replay every recorded call in start order; returns the observed latencies.
+
+    Each call sleeps its own recorded latency times `latency_scale`. With
+    paced=True each call is also started at its recorded offset from the
+    earliest call (times `latency_scale`), reproducing the original arrival
+    pattern instead of firing calls back-to-back. Offsets come from
+    wall-clock start times, so gaps between separate recording sessions are
+    replayed too, and `concurrency` must be high enough to cover the calls
+    that overlapped. Entries recorded without a start time go first,
+    back-to-back.
+    """
+    # The cassette is in completion order; overlapping calls must be replayed in start order
+    entries = sorted(cassette.order, key=lambda entry: entry.get("started", float("-inf")))
+    first_started = min((entry["started"] for entry in entries if "started" in entry), default=None)
+    replay_start = time.perf_counter()
+
+    def replay_entry(entry):
+        if paced and first_started is not None and "started" in entry:
+            delay = replay_start + (entry["started"] - first_started) * latency_scale - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        start = time.perf_counter()
+        if latency_scale > 0:
+            time.sleep(entry["latency"] * latency_scale)
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        return list(executor.map(replay_entry, entries))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay a recorded LLM cassette offline.")
+    parser.add_argument("cassette", nargs="?", default="llm_cassette.jsonl")
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="multiplier for recorded latencies and offsets (0 = no delay)")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--paced", action="store_true", help="start calls at their recorded offsets")
+    args = parser.parse_args()
+
+    cassette = Cassette(args.cassette)
+    recorded = [entry["latency"] for entry in cassette.order]
+    start = time.perf_counter()
+    latencies = replay_cassette(cassette, args.latency_scale, args.concurrency, args.paced)
+    wall_time = time.perf_counter() - start
+
+    if latencies:
+        latencies.sort()
+        print(f"Replayed {len(latencies)} call(s) in {wall_time:.2f}s "
+              f"(latency scale={args.latency_scale}, concurrency={args.concurrency}, paced={args.paced})")
+        print(f"Recorded total latency: {sum(recorded):.2f}s")
+        print(f"p50: {latencies[len(latencies) // 2]:.3f}s  "
+              f"p95: {latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]:.3f}s  "
+              f"max: {latencies[-1]:.3f}s")
+    else:
+        print(f"No recorded calls in {args.cassette}")
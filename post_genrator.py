@@ -1,7 +1,7 @@
 from llm_helper import llm
-from few_shot import FewShotPosts
+from few_shot import CorpusRegistry, DEFAULT_CORPUS
 
-few_shot = FewShotPosts()
+few_shot = CorpusRegistry()
 
 # You can expand this mapping based on your needs
 TAG_ALIASES = {
@@ -32,13 +32,13 @@ def get_length_str(length):
     if length == "Long":
         return "11 to 15 lines"
 
-def generate_post(length, language, raw_tag):
+def generate_post(length, language, raw_tag, corpus_id=DEFAULT_CORPUS):
     tag = map_to_tag(raw_tag)  # Automatically map spoken/typed tag
-    prompt = get_prompt(length, language, tag)
+    prompt = get_prompt(length, language, tag, corpus_id)
     response = llm.invoke(prompt)
     return response.content
 
-def get_prompt(length, language, tag):
+def get_prompt(length, language, tag, corpus_id=DEFAULT_CORPUS):
     length_str = get_length_str(length)
 
     prompt = f'''
@@ -51,7 +51,7 @@ If Language is Hinglish then it means it is a mix of Hindi and English.
 The script for the generated post should always be English.
 '''
 
-    examples = few_shot.get_filtered_posts(length, language, tag)
+    examples = few_shot.get_filtered_posts(length, language, tag, corpus_id)
 
     if len(examples) > 0:
         prompt += "\n4) Use the writing style as per the following examples."
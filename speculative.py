@@ -0,0 +1,86 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class SpeculativeGenerator:
+    """Starts generating a post in the background once the selection stops changing.
+
+    update() is called on every Streamlit rerun with the current selection.
+    The first selection seen (the widget defaults) is never speculated on;
+    after the user changes it and it stays stable for `debounce` seconds a
+    generation starts in a worker thread, and take() hands back that result
+    instead of calling the LLM again. Every speculative call counts against
+    `max_wasted` when it starts and is refunded when take() uses it (or when
+    it is cancelled before reaching the LLM), so at most `max_wasted` calls
+    per session are spent on results nobody asked for.
+    """
+
+    def __init__(self, generate, debounce=1.5, max_wasted=3):
+        self.generate = generate
+        self.debounce = debounce
+        self.max_wasted = max_wasted
+        self.wasted = 0
+        self.selection = None
+        self.generation = 0
+        self.timer = None
+        self.future = None
+        self.future_selection = None
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.lock = threading.Lock()
+
+    def update(self, selection):
+        """Record the current selection and (re)arm the debounce timer if it changed."""
+        with self.lock:
+            if selection == self.selection:
+                return
+            first_render = self.selection is None
+            self.selection = selection
+            self.generation += 1
+            self.cancel_stale()
+            if first_render or self.wasted >= self.max_wasted:
+                return
+            self.timer = threading.Timer(self.debounce, self.start, args=(self.generation,))
+            self.timer.daemon = True
+            self.timer.start()
+
+    def start(self, generation):
+        with self.lock:
+            # A timer that fired after the selection changed or take() ran is stale
+            if generation != self.generation or self.future is not None or self.wasted >= self.max_wasted:
+                return
+            self.wasted += 1
+            self.future = self.executor.submit(self.generate, *self.selection)
+            self.future_selection = self.selection
+
+    def cancel_stale(self):
+        """Drop pending or queued work for a selection that is no longer current."""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if self.future is not None and self.future_selection != self.selection:
+            # A call that already reached the LLM can't be stopped, only discarded
+            if self.future.cancel():
+                self.wasted -= 1
+            self.future = None
+            self.future_selection = None
+
+    def take(self, selection):
+        """Return the post for `selection`, reusing the speculative result when it matches."""
+        with self.lock:
+            self.selection = selection
+            self.generation += 1
+            self.cancel_stale()
+            future = self.future
+            self.future = None
+            self.future_selection = None
+            if future is not None:
+                # Used (or never started) speculative work is not wasted
+                self.wasted -= 1
+                if future.cancel():
+                    # Still queued behind a discarded call, calling directly is faster
+                    future = None
+        if future is not None:
+            # A failed background call raises here, just like a direct call would,
+            # rather than silently retrying an error (bad key, rate limit) a retry can't fix
+            return future.result()
+        return self.generate(*selection)
@@ -0,0 +1,149 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import few_shot
+from few_shot import CorpusRegistry, FewShotPosts, DEFAULT_CORPUS
+
+POSTS = [
+    {"text": "Keep going.", "engagement": 10, "line_count": 2, "language": "English", "tags": ["Motivation"]},
+    {"text": "Ship it.", "engagement": 5, "line_count": 7, "language": "English", "tags": ["Startups", "Growth"]},
+]
+
+
+class SlowFewShotPosts(FewShotPosts):
+    loads = 0
+
+    def __init__(self, file_path):
+        SlowFewShotPosts.loads += 1
+        time.sleep(0.2)
+        super().__init__(file_path)
+
+
+class CorpusRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.corpus_dir = os.path.join(self.tmp_dir, "corpora")
+        os.mkdir(self.corpus_dir)
+        self.default_file = self.write_corpus(os.path.join(self.tmp_dir, "process_data.json"))
+        for corpus_id in ("alice", "bob", "carol"):
+            self.write_corpus(os.path.join(self.corpus_dir, f"{corpus_id}.json"))
+        self.shard_bytes = FewShotPosts(self.default_file).memory_bytes()
+        SlowFewShotPosts.loads = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write_corpus(self, file_path):
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(POSTS, f)
+        return file_path
+
+    def make_registry(self, max_shards=10):
+        # Budget fits `max_shards` shards but not one more
+        max_memory_mb = (self.shard_bytes * max_shards + self.shard_bytes // 2) / (1024 * 1024)
+        return CorpusRegistry(self.corpus_dir, max_memory_mb, self.default_file)
+
+    def test_loads_lazily_on_first_get(self):
+        registry = self.make_registry()
+        self.assertEqual(registry.get_corpus_ids(), ["alice", "bob", "carol", DEFAULT_CORPUS])
+        self.assertEqual(registry.stats()["loaded"], {})
+
+        posts = registry.get_filtered_posts("Short", "English", "Motivation", "alice")
+        self.assertEqual([post["text"] for post in posts], ["Keep going."])
+        self.assertEqual(list(registry.stats()["loaded"]), ["alice"])
+
+    def test_default_json_in_corpus_dir_is_ignored(self):
+        self.write_corpus(os.path.join(self.corpus_dir, "default.json"))
+        registry = self.make_registry()
+        self.assertEqual(registry.paths[DEFAULT_CORPUS], self.default_file)
+
+    def test_stats_count_hits_misses_and_evictions(self):
+        registry = self.make_registry(max_shards=2)
+        registry.get("alice")
+        registry.get("alice")
+        registry.get("bob")
+        registry.get("carol")
+        stats = registry.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (1, 3, 1))
+        self.assertLessEqual(stats["resident_bytes"], stats["max_memory_bytes"])
+
+    def test_evicts_least_recently_used_and_keeps_newest(self):
+        registry = self.make_registry(max_shards=2)
+        registry.get("alice")
+        registry.get("bob")
+        registry.get("alice")  # bob is now least recently used
+        registry.get("carol")
+        self.assertEqual(list(registry.stats()["loaded"]), ["alice", "carol"])
+
+        tiny = CorpusRegistry(self.corpus_dir, max_memory_mb=0, default_file=self.default_file)
+        tiny.get("alice")
+        tiny.get("bob")
+        self.assertEqual(list(tiny.stats()["loaded"]), ["bob"])
+
+    def test_unknown_corpus_raises_key_error(self):
+        with self.assertRaises(KeyError):
+            self.make_registry().get("nobody")
+
+    def test_failed_load_does_not_evict_healthy_shards(self):
+        registry = self.make_registry(max_shards=1)
+        registry.get("alice")
+        registry.register("broken", os.path.join(self.corpus_dir, "missing.json"))
+        with self.assertRaises(FileNotFoundError):
+            registry.get("broken")
+        self.assertEqual(list(registry.stats()["loaded"]), ["alice"])
+
+    def test_concurrent_gets_share_one_load(self):
+        registry = self.make_registry()
+        with mock.patch.object(few_shot, "FewShotPosts", SlowFewShotPosts):
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(registry.get("alice"))) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(SlowFewShotPosts.loads, 1)
+        self.assertIs(results[0], results[1])
+        self.assertEqual(registry.stats()["coalesced"], 1)
+
+    def test_failed_load_is_raised_to_every_waiter(self):
+        registry = self.make_registry()
+        registry.register("broken", os.path.join(self.corpus_dir, "missing.json"))
+        errors = []
+
+        def get_broken():
+            try:
+                registry.get("broken")
+            except FileNotFoundError as e:
+                errors.append(e)
+
+        with mock.patch.object(few_shot, "FewShotPosts", SlowFewShotPosts):
+            threads = [threading.Thread(target=get_broken) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(SlowFewShotPosts.loads, 1)
+        self.assertEqual(len(errors), 2)
+
+    def test_register_during_load_does_not_hand_out_old_file(self):
+        registry = self.make_registry()
+        new_file = self.write_corpus(os.path.join(self.tmp_dir, "alice_v2.json"))
+        with mock.patch.object(few_shot, "FewShotPosts", SlowFewShotPosts):
+            old_load = threading.Thread(target=registry.get, args=("alice",))
+            old_load.start()
+            time.sleep(0.05)
+            registry.register("alice", new_file)
+            shard = registry.get("alice")
+            old_load.join()
+        self.assertEqual(SlowFewShotPosts.loads, 2)
+        self.assertIs(registry.get("alice"), shard)
+
+
+if __name__ == "__main__":
+    unittest.main()
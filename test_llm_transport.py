@@ -0,0 +1,89 @@
+import os
+import tempfile
+import time
+import unittest
+
+from langchain_core.messages import AIMessage
+from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import RunnableLambda
+
+from llm_transport import Cassette, RecordingTransport, ReplayTransport, prompt_key, replay_cassette
+
+
+class StubLLM:
+    """Answers with a numbered echo of the prompt, so repeated prompts get different responses."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+
+    def invoke(self, input, config=None, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        return AIMessage(content=f"{self.calls}: {input.to_string() if hasattr(input, 'to_string') else input}")
+
+
+class LLMTransportTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.cassette_path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(fd)
+        os.remove(self.cassette_path)
+
+    def tearDown(self):
+        if os.path.exists(self.cassette_path):
+            os.remove(self.cassette_path)
+
+    def test_record_replay_round_trip_through_prompt_chain(self):
+        pt = PromptTemplate.from_template("Extract metadata from: {post_text}")
+        recorder = RecordingTransport(RunnableLambda(StubLLM().invoke), Cassette(self.cassette_path, load=False))
+        recorded = (pt | recorder).invoke({"post_text": "hello"}).content
+
+        cassette = Cassette(self.cassette_path)
+        self.assertEqual(cassette.order[0]["key"], prompt_key("Extract metadata from: hello"))
+
+        replayed = (pt | ReplayTransport(cassette, latency_scale=0)).invoke({"post_text": "hello"}).content
+        self.assertEqual(replayed, recorded)
+
+    def test_repeated_prompt_replays_in_order_and_wraps_around(self):
+        recorder = RecordingTransport(StubLLM(), Cassette(self.cassette_path, load=False))
+        first = recorder.invoke("same prompt").content
+        second = recorder.invoke("same prompt").content
+
+        replay = ReplayTransport(Cassette(self.cassette_path), latency_scale=0)
+        self.assertEqual([replay.invoke("same prompt").content for _ in range(3)], [first, second, first])
+
+    def test_missing_prompt_raises_key_error(self):
+        RecordingTransport(StubLLM(), Cassette(self.cassette_path, load=False)).invoke("recorded")
+        replay = ReplayTransport(Cassette(self.cassette_path), latency_scale=0)
+        with self.assertRaises(KeyError):
+            replay.invoke("never recorded")
+
+    def test_latency_scale_applies_recorded_latency(self):
+        RecordingTransport(StubLLM(delay=0.2), Cassette(self.cassette_path, load=False)).invoke("slow")
+        replay = ReplayTransport(Cassette(self.cassette_path), latency_scale=0.5)
+        start = time.perf_counter()
+        replay.invoke("slow")
+        self.assertAlmostEqual(time.perf_counter() - start, 0.1, delta=0.05)
+
+    def test_paced_replay_uses_start_order_for_overlapping_calls(self):
+        cassette = Cassette(self.cassette_path)
+        # Appended in completion order: "b" started after "a" but finished first
+        cassette.append("b", "B", 0.05, 100.2)
+        cassette.append("a", "A", 0.5, 100.0)
+        cassette.append("d", "D", 0.01, 100.6)
+
+        start = time.perf_counter()
+        latencies = replay_cassette(cassette, latency_scale=1.0, concurrency=3, paced=True)
+        wall_time = time.perf_counter() - start
+
+        # "d" starts 0.6s after the earliest call ("a"), not after the first one to finish
+        self.assertGreaterEqual(wall_time, 0.6)
+        self.assertLess(wall_time, 0.8)
+        # Latencies come back in start order and each sleeps its own recorded latency
+        self.assertEqual(len(latencies), 3)
+        for latency, expected in zip(latencies, [0.5, 0.05, 0.01]):
+            self.assertAlmostEqual(latency, expected, delta=0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
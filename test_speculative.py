@@ -0,0 +1,111 @@
+import threading
+import time
+import unittest
+
+from speculative import SpeculativeGenerator
+
+
+class StubGenerate:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, length, language, tag):
+        with self.lock:
+            self.calls.append((length, language, tag))
+        time.sleep(self.delay)
+        return f"{length} {language} {tag}"
+
+
+A = ("Short", "English", "AI")
+B = ("Long", "English", "AI")
+C = ("Medium", "Hinglish", "Careers")
+
+
+class SpeculativeGeneratorTest(unittest.TestCase):
+    def test_first_selection_is_not_speculated(self):
+        stub = StubGenerate()
+        spec = SpeculativeGenerator(stub, debounce=0.05)
+        spec.update(A)
+        time.sleep(0.15)
+        self.assertEqual(stub.calls, [])
+
+    def test_take_reuses_result_after_debounce(self):
+        stub = StubGenerate()
+        spec = SpeculativeGenerator(stub, debounce=0.05)
+        spec.update(A)
+        spec.update(B)
+        time.sleep(0.15)
+        self.assertEqual(spec.take(B), "Long English AI")
+        self.assertEqual(stub.calls, [B])
+        self.assertEqual(spec.wasted, 0)
+
+    def test_changing_selection_before_debounce_cancels_timer(self):
+        stub = StubGenerate()
+        spec = SpeculativeGenerator(stub, debounce=0.1)
+        spec.update(A)
+        spec.update(B)
+        time.sleep(0.03)
+        spec.update(C)
+        time.sleep(0.2)
+        self.assertEqual(stub.calls, [C])
+        self.assertEqual(spec.wasted, 1)
+
+    def test_unused_result_counts_against_budget(self):
+        stub = StubGenerate()
+        spec = SpeculativeGenerator(stub, debounce=0.02, max_wasted=1)
+        spec.update(A)
+        spec.update(B)
+        time.sleep(0.1)
+        spec.update(C)
+        time.sleep(0.1)
+        # B was generated and never taken, so the budget is spent
+        self.assertEqual(stub.calls, [B])
+        self.assertEqual(spec.wasted, 1)
+        self.assertEqual(spec.take(C), "Medium Hinglish Careers")
+        self.assertEqual(stub.calls, [B, C])
+
+    def test_take_does_not_wait_behind_discarded_call(self):
+        stub = StubGenerate(delay=0.5)
+        spec = SpeculativeGenerator(stub, debounce=0.02)
+        spec.update(A)
+        spec.update(B)
+        time.sleep(0.1)  # B is running in the only worker
+        spec.update(C)
+        time.sleep(0.1)  # C is queued behind the discarded B
+        start = time.perf_counter()
+        self.assertEqual(spec.take(C), "Medium Hinglish Careers")
+        self.assertLess(time.perf_counter() - start, 0.65)
+        self.assertEqual(spec.wasted, 1)
+
+    def test_timer_that_fired_during_take_does_not_submit(self):
+        stub = StubGenerate()
+        spec = SpeculativeGenerator(stub, debounce=10)
+        spec.update(A)
+        spec.update(B)
+        stale_generation = spec.generation
+        spec.take(B)
+        spec.start(stale_generation)  # simulates the timer firing while take() held the lock
+        self.assertIsNone(spec.future)
+        self.assertEqual(stub.calls, [B])
+        self.assertEqual(spec.wasted, 0)
+
+    def test_background_error_is_raised_without_retry(self):
+        calls = []
+
+        def failing_generate(*selection):
+            calls.append(selection)
+            raise RuntimeError("rate limited")
+
+        spec = SpeculativeGenerator(failing_generate, debounce=0.02)
+        spec.update(A)
+        spec.update(B)
+        time.sleep(0.1)
+        with self.assertRaisesRegex(RuntimeError, "rate limited"):
+            spec.take(B)
+        self.assertEqual(calls, [B])
+
+
+if __name__ == "__main__":
+    unittest.main()